@@ -3,12 +3,20 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
 from typing import Sequence
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    """Main entry point for the subagent CLI."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the subagent argument parser.
+
+    The parser is cached so repeated in-process calls to ``main`` reuse it.
+    Defaults computed while building it, such as the ``--target-root``
+    location under ``Path.home()``, are therefore fixed at the first call;
+    changing ``HOME`` afterwards does not affect them.
+    """
     parser = argparse.ArgumentParser(
         prog="subagent",
         description="Manage workspace agents across different backends",
@@ -56,8 +64,13 @@ def main(argv: Sequence[str] | None = None) -> int:
     add_warmup_parser(code_insiders_subparsers)
     add_list_parser(code_insiders_subparsers)
     add_unlock_parser(code_insiders_subparsers)
-    
-    args = parser.parse_args(argv)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Main entry point for the subagent CLI."""
+    args = _build_parser().parse_args(argv)
     
     # Determine which VS Code executable to use
     vscode_cmd = "code-insiders" if args.command == "code-insiders" else "code"
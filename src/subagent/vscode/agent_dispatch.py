@@ -56,18 +56,19 @@ def find_unlocked_subagent(subagent_root: Path) -> Optional[Path]:
     Returns the path to the first subagent-* directory that does not contain
     a subagent.lock file. Returns None if no unlocked subagents are found.
     """
-    if not subagent_root.exists():
+    root = os.fspath(subagent_root)
+    try:
+        with os.scandir(root) as entries:
+            names = sorted(
+                (e.name for e in entries if e.name.startswith("subagent-") and e.is_dir()),
+                key=lambda name: int(name.split("-")[1]),
+            )
+    except FileNotFoundError:
         return None
     
-    subagents = sorted(
-        (d for d in subagent_root.iterdir() if d.is_dir() and d.name.startswith("subagent-")),
-        key=lambda d: int(d.name.split("-")[1])
-    )
-    
-    for subagent_dir in subagents:
-        lock_file = subagent_dir / DEFAULT_LOCK_NAME
-        if not lock_file.exists():
-            return subagent_dir
+    for name in names:
+        if not os.path.lexists(os.path.join(root, name, DEFAULT_LOCK_NAME)):
+            return subagent_root / name
     
     return None
 
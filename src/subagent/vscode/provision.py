@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import os
 import shutil
 import sys
 from pathlib import Path
@@ -80,6 +81,17 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _copy_workspace(workspace_src: Path, subagent_dir: Path) -> None:
+    """Copy only the template workspace file into ``subagent_dir``.
+
+    Each subagent gets its own copy rather than a hard link, since VS Code
+    rewrites workspace files in place and a link would leak edits back into
+    the template. Metadata is not copied; the workspace only needs its content.
+    """
+    workspace_dst = subagent_dir / f"{subagent_dir.name}.code-workspace"
+    shutil.copyfile(workspace_src, workspace_dst)
+
+
 def provision_subagents(
     *,
     template: Path,
@@ -107,35 +119,41 @@ def provision_subagents(
     if not template_path.is_dir():
         raise ValueError(f"template path {template_path} is not a directory")
 
+    workspace_src = template_path / "subagent.code-workspace"
+
     if not dry_run:
         target_path.mkdir(parents=True, exist_ok=True)
 
-    # First, scan existing subagents to count unlocked ones and find the highest number
+    # First, scan existing subagents in a single directory pass to record which
+    # are locked and find the highest number. DirEntry.is_dir() reuses the type
+    # reported by the directory listing, so no per-entry stat is needed.
     # Filter out directories that don't have a valid integer after "subagent-"
-    existing_subagents = []
-    if target_path.exists():
-        for d in target_path.iterdir():
-            if d.is_dir() and d.name.startswith("subagent-"):
+    existing_subagents: List[Tuple[int, str]] = []
+    try:
+        with os.scandir(target_path) as entries:
+            for entry in entries:
+                if not entry.name.startswith("subagent-") or not entry.is_dir():
+                    continue
                 try:
-                    int(d.name.split("-")[1])
-                    existing_subagents.append(d)
+                    existing_subagents.append((int(entry.name.split("-")[1]), entry.name))
                 except (ValueError, IndexError):
                     # Skip directories that don't follow the subagent-N pattern
                     continue
-        existing_subagents.sort(key=lambda d: int(d.name.split("-")[1]))
+    except FileNotFoundError:
+        pass
+    existing_subagents.sort()
 
-    unlocked_count = 0
     highest_number = 0
+    locked_names: set[str] = set()
     locked_subagents = []
 
-    for subagent_dir in existing_subagents:
-        subagent_number = int(subagent_dir.name.split("-")[1])
+    for subagent_number, name in existing_subagents:
         highest_number = max(highest_number, subagent_number)
-        lock_file = subagent_dir / lock_name
-        if not lock_file.exists():
-            unlocked_count += 1
-        else:
-            locked_subagents.append(subagent_dir)
+        if os.path.lexists(os.path.join(target_path, name, lock_name)):
+            locked_names.add(name)
+            locked_subagents.append(target_path / name)
+
+    existing_names = {name for _, name in existing_subagents}
 
     created: List[Path] = []
     skipped_existing: List[Path] = []
@@ -149,30 +167,30 @@ def provision_subagents(
         if subagents_provisioned >= subagents:
             break
             
-        subagent_dir = target_path / f"subagent-{index}"
+        name = f"subagent-{index}"
+        subagent_dir = target_path / name
         lock_file = subagent_dir / lock_name
 
-        if subagent_dir.exists():
+        if name in existing_names:
+            is_locked = name in locked_names
+
             # Skip locked subagents unless force is enabled
-            if lock_file.exists() and not force:
+            if is_locked and not force:
                 continue
             
             # When force is enabled, unlock and overwrite all existing subagents
             if force:
                 if not dry_run:
                     # Remove lock file if it exists
-                    if lock_file.exists():
-                        lock_file.unlink()
-                    # Copy only the workspace file
-                    workspace_src = template_path / "subagent.code-workspace"
-                    workspace_dst = subagent_dir / f"{subagent_dir.name}.code-workspace"
-                    shutil.copy2(workspace_src, workspace_dst)
+                    if is_locked:
+                        lock_file.unlink(missing_ok=True)
+                    _copy_workspace(workspace_src, subagent_dir)
                 created.append(subagent_dir)
                 # Remove from locked list since we're processing it
                 if subagent_dir in locked_subagents:
                     locked_subagents.remove(subagent_dir)
                 subagents_provisioned += 1
-            elif not lock_file.exists():
+            else:
                 # Without force, unlocked subagent - skip it as it's already provisioned
                 skipped_existing.append(subagent_dir)
                 subagents_provisioned += 1
@@ -182,10 +200,7 @@ def provision_subagents(
                 created.append(subagent_dir)
             else:
                 subagent_dir.mkdir(parents=True, exist_ok=True)
-                # Copy only the workspace file
-                workspace_src = template_path / "subagent.code-workspace"
-                workspace_dst = subagent_dir / f"{subagent_dir.name}.code-workspace"
-                shutil.copy2(workspace_src, workspace_dst)
+                _copy_workspace(workspace_src, subagent_dir)
                 created.append(subagent_dir)
             subagents_provisioned += 1
 
@@ -199,10 +214,7 @@ def provision_subagents(
             created.append(subagent_dir)
         else:
             subagent_dir.mkdir(parents=True, exist_ok=True)
-            # Copy only the workspace file
-            workspace_src = template_path / "subagent.code-workspace"
-            workspace_dst = subagent_dir / f"{subagent_dir.name}.code-workspace"
-            shutil.copy2(workspace_src, workspace_dst)
+            _copy_workspace(workspace_src, subagent_dir)
             created.append(subagent_dir)
         subagents_provisioned += 1
 
@@ -0,0 +1,114 @@
+"""Shared pytest fixtures for the subagent test suite."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Iterable
+from unittest.mock import MagicMock
+
+import pytest
+
+from helpers import WORKSPACE_BYTES, seed
+
+
+def _write_workspace(path: str | os.PathLike[str]) -> None:
+    """Write WORKSPACE_BYTES to ``path`` without the text or buffered I/O layers."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, WORKSPACE_BYTES)
+    finally:
+        os.close(fd)
+
+
+def _build_workspaces(root: Path, numbers: Iterable[int]) -> None:
+    """Create ``subagent-N/subagent-N.code-workspace`` under ``root`` for each N."""
+    root_s = os.fspath(root)
+    for i in numbers:
+        subagent_dir = f"{root_s}{os.sep}subagent-{i}"
+        os.mkdir(subagent_dir)
+        _write_workspace(f"{subagent_dir}{os.sep}subagent-{i}.code-workspace")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Import the CLI stack once, before any test module is collected."""
+    import subagent.cli  # noqa: F401
+    import subagent.vscode.cli  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+def template_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a minimal template directory shared by the whole session.
+
+    Provisioning only reads from the template, so it is built once.
+    """
+    template = tmp_path_factory.mktemp("template", numbered=False)
+    (template / "subagent.code-workspace").write_bytes(WORKSPACE_BYTES)
+    return template
+
+
+@pytest.fixture(scope="session")
+def agent_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a minimal skill template with SKILL definitions."""
+    template = tmp_path_factory.mktemp("skill-template", numbered=False)
+    (template / "SKILL.md").write_text(
+        """---
+description: Test Agent
+model: test-model
+tools: [one]
+---
+
+Primary body content.
+"""
+    )
+    (template / "subagent.code-workspace").write_bytes(WORKSPACE_BYTES)
+    return template
+
+
+@pytest.fixture
+def fake_warmup(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace the CLI's warmup_subagents with a mock that reports success."""
+    mock = MagicMock(return_value=0)
+    monkeypatch.setattr("subagent.vscode.cli.warmup_subagents", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_popen(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace subprocess.Popen so no VS Code processes are launched."""
+    mock = MagicMock()
+    monkeypatch.setattr("subprocess.Popen", mock)
+    return mock
+
+
+@pytest.fixture(scope="session")
+def workspace_tree(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a read-only subagent root with five workspaces, shared by the session.
+
+    Subagents are created out of order to exercise sorting, alongside a
+    non-subagent directory that must be ignored.
+    """
+    root = tmp_path_factory.mktemp("workspace-tree", numbered=False)
+    _build_workspaces(root, [1, 3, 2, 5, 4])
+
+    seed(root, ["other-dir"])
+    _write_workspace(root / "other-dir" / "subagent.code-workspace")
+    return root
+
+
+@pytest.fixture(scope="session")
+def workspace_tree_factory(tmp_path_factory: pytest.TempPathFactory) -> Callable[[int], Path]:
+    """Return a builder for read-only roots holding subagent-1..n workspaces.
+
+    Each size is built at most once per session.
+    """
+    trees: dict[int, Path] = {}
+
+    def build(count: int) -> Path:
+        if count not in trees:
+            root = tmp_path_factory.mktemp(f"workspaces-{count}")
+            _build_workspaces(root, range(1, count + 1))
+            trees[count] = root
+        return trees[count]
+
+    return build
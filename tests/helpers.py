@@ -0,0 +1,29 @@
+"""Filesystem helpers shared by the subagent test modules."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+from subagent.vscode.provision import DEFAULT_LOCK_NAME
+
+# Contents of a minimal .code-workspace file, pre-encoded for write_bytes.
+WORKSPACE_BYTES = b'{"folders": []}\n'
+
+
+def lock_path(root: Path, i: int, lock_name: str = DEFAULT_LOCK_NAME) -> str:
+    """Return the lock file path of ``subagent-{i}`` under ``root`` as a string."""
+    return os.path.join(os.fspath(root), f"subagent-{i}", lock_name)
+
+
+def seed(root: Path, dirs: Iterable[str] = (), files: Iterable[str] = ()) -> None:
+    """Create empty directories and files under ``root`` with raw ``os`` calls.
+
+    Paths are relative to ``root``; directories are created in order before files.
+    """
+    root_s = os.fspath(root)
+    for d in dirs:
+        os.mkdir(os.path.join(root_s, d))
+    for f in files:
+        os.close(os.open(os.path.join(root_s, f), os.O_CREAT | os.O_WRONLY, 0o644))
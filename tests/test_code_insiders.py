@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
 from subagent.cli import main
 
+from helpers import WORKSPACE_BYTES
+
 
 def test_code_insiders_command_available() -> None:
     """Test that code-insiders command is available."""
@@ -17,95 +20,84 @@ def test_code_insiders_command_available() -> None:
     assert exc_info.value.code == 2
 
 
-def test_code_insiders_provision_help() -> None:
-    """Test that code-insiders provision help works."""
-    with pytest.raises(SystemExit) as exc_info:
-        main(["code-insiders", "provision", "--help"])
-    # Help should exit with code 0
-    assert exc_info.value.code == 0
-
-
-def test_code_insiders_chat_help() -> None:
-    """Test that code-insiders chat help works."""
-    with pytest.raises(SystemExit) as exc_info:
-        main(["code-insiders", "chat", "--help"])
-    # Help should exit with code 0
-    assert exc_info.value.code == 0
-
-
-def test_code_insiders_warmup_help() -> None:
-    """Test that code-insiders warmup help works."""
-    with pytest.raises(SystemExit) as exc_info:
-        main(["code-insiders", "warmup", "--help"])
-    # Help should exit with code 0
-    assert exc_info.value.code == 0
-
-
-def test_code_insiders_list_help() -> None:
-    """Test that code-insiders list help works."""
-    with pytest.raises(SystemExit) as exc_info:
-        main(["code-insiders", "list", "--help"])
-    # Help should exit with code 0
-    assert exc_info.value.code == 0
-
-
-def test_code_insiders_unlock_help() -> None:
-    """Test that code-insiders unlock help works."""
+@pytest.mark.parametrize("subcommand", ["provision", "chat", "warmup", "list", "unlock"])
+def test_code_insiders_subcommand_help(subcommand: str) -> None:
+    """Test that code-insiders subcommand help works."""
     with pytest.raises(SystemExit) as exc_info:
-        main(["code-insiders", "unlock", "--help"])
+        main(["code-insiders", subcommand, "--help"])
     # Help should exit with code 0
     assert exc_info.value.code == 0
 
 
-@patch("subagent.vscode.cli.warmup_subagents")
-@patch("subagent.vscode.cli.get_subagent_root")
 def test_code_insiders_warmup_passes_correct_vscode_cmd(
-    mock_get_root: MagicMock,
-    mock_warmup: MagicMock,
-    tmp_path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_warmup: MagicMock,
 ) -> None:
     """Test that code-insiders warmup passes vscode_cmd='code-insiders'."""
-    mock_get_root.return_value = tmp_path / "agents"
-    mock_warmup.return_value = 0
-    
     # Create a dummy subagent directory
     root = tmp_path / "agents"
     root.mkdir()
     subagent = root / "subagent-1"
     subagent.mkdir()
-    (subagent / "subagent-1.code-workspace").write_text('{"folders": []}')
+    (subagent / "subagent-1.code-workspace").write_bytes(WORKSPACE_BYTES)
+
+    monkeypatch.setattr("subagent.vscode.cli.get_subagent_root", lambda: root)
     
     result = main(["code-insiders", "warmup", "--subagents", "1", "--target-root", str(root)])
     
     # Verify warmup was called with vscode_cmd='code-insiders'
-    mock_warmup.assert_called_once()
-    call_kwargs = mock_warmup.call_args.kwargs
-    assert call_kwargs["vscode_cmd"] == "code-insiders"
+    fake_warmup.assert_called_once_with(
+        subagent_root=root,
+        subagents=1,
+        dry_run=False,
+        vscode_cmd="code-insiders",
+    )
     assert result == 0
 
 
-@patch("subagent.vscode.cli.warmup_subagents")
-@patch("subagent.vscode.cli.get_subagent_root")
 def test_code_warmup_passes_correct_vscode_cmd(
-    mock_get_root: MagicMock,
-    mock_warmup: MagicMock,
-    tmp_path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_warmup: MagicMock,
 ) -> None:
     """Test that code warmup passes vscode_cmd='code' (default)."""
-    mock_get_root.return_value = tmp_path / "agents"
-    mock_warmup.return_value = 0
-    
     # Create a dummy subagent directory
     root = tmp_path / "agents"
     root.mkdir()
     subagent = root / "subagent-1"
     subagent.mkdir()
-    (subagent / "subagent-1.code-workspace").write_text('{"folders": []}')
+    (subagent / "subagent-1.code-workspace").write_bytes(WORKSPACE_BYTES)
+
+    monkeypatch.setattr("subagent.vscode.cli.get_subagent_root", lambda: root)
     
     result = main(["code", "warmup", "--subagents", "1", "--target-root", str(root)])
     
     # Verify warmup was called with vscode_cmd='code'
-    mock_warmup.assert_called_once()
-    call_kwargs = mock_warmup.call_args.kwargs
-    assert call_kwargs["vscode_cmd"] == "code"
+    fake_warmup.assert_called_once_with(
+        subagent_root=root,
+        subagents=1,
+        dry_run=False,
+        vscode_cmd="code",
+    )
     assert result == 0
+
+
+def test_main_does_not_leak_state_between_calls(
+    tmp_path: Path,
+    fake_warmup: MagicMock,
+) -> None:
+    """Test that repeated main() calls on the cached parser parse independently."""
+    root = tmp_path / "agents"
+
+    main(["code-insiders", "warmup", "--subagents", "3", "--target-root", str(root), "--dry-run"])
+    main(["code", "warmup", "--target-root", str(root)])
+
+    assert fake_warmup.call_count == 2
+    # Defaults apply again on the second call instead of values from the first
+    assert fake_warmup.call_args.kwargs == {
+        "subagent_root": root,
+        "subagents": 1,
+        "dry_run": False,
+        "vscode_cmd": "code",
+    }
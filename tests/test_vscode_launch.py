@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-import argparse
 from pathlib import Path
-from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -14,71 +12,55 @@ from subagent.vscode.agent_dispatch import (
     create_subagent_lock,
     DEFAULT_LOCK_NAME,
 )
-from subagent.vscode.cli import handle_chat
 
+from helpers import seed
 
-@pytest.fixture
-def subagent_root(tmp_path: Path) -> Path:
-    """Create a subagent root with some test subagents."""
-    root = tmp_path / "agents"
-    root.mkdir()
 
-    # Create three subagents: one locked, two unlocked
-    for i in range(1, 4):
-        subagent = root / f"subagent-{i}"
-        subagent.mkdir()
+class TestFindUnlocked:
+    """Read-only lookups against class-scoped subagent trees."""
 
-    # Lock subagent-1
-    (root / "subagent-1" / DEFAULT_LOCK_NAME).touch()
+    @pytest.fixture(scope="class")
+    @classmethod
+    def subagent_root(cls, tmp_path_factory: pytest.TempPathFactory) -> Path:
+        """Create a subagent root with some test subagents."""
+        root = tmp_path_factory.mktemp("agents")
 
-    return root
+        # Create three subagents: one locked, two unlocked
+        seed(
+            root,
+            ["subagent-1", "subagent-2", "subagent-3"],
+            [f"subagent-1/{DEFAULT_LOCK_NAME}"],
+        )
 
+        return root
 
-@pytest.fixture
-def agent_template(tmp_path: Path) -> Path:
-    """Create a minimal skill template with SKILL definitions."""
-    template = tmp_path / "skill-template"
-    template.mkdir()
-    (template / "SKILL.md").write_text(
-        """---
-description: Test Agent
-model: test-model
-tools: [one]
----
+    @pytest.fixture(scope="class")
+    @classmethod
+    def all_locked_root(cls, tmp_path_factory: pytest.TempPathFactory) -> Path:
+        """Create a subagent root whose only subagent is locked."""
+        root = tmp_path_factory.mktemp("agents-locked")
 
-Primary body content.
-"""
-    )
-    (template / "subagent.code-workspace").write_text('{"folders": []}\n')
-    return template
+        # Create one locked subagent
+        seed(root, ["subagent-1"], [f"subagent-1/{DEFAULT_LOCK_NAME}"])
 
+        return root
 
-def test_find_unlocked_subagent(subagent_root: Path) -> None:
-    """Test finding the first unlocked subagent."""
-    unlocked = find_unlocked_subagent(subagent_root)
-    assert unlocked is not None
-    assert unlocked.name == "subagent-2"
+    def test_find_unlocked_subagent(self, subagent_root: Path) -> None:
+        """Test finding the first unlocked subagent."""
+        unlocked = find_unlocked_subagent(subagent_root)
+        assert unlocked is not None
+        assert unlocked.name == "subagent-2"
 
+    def test_find_unlocked_subagent_none_available(self, all_locked_root: Path) -> None:
+        """Test when no unlocked subagents are available."""
+        unlocked = find_unlocked_subagent(all_locked_root)
+        assert unlocked is None
 
-def test_find_unlocked_subagent_none_available(tmp_path: Path) -> None:
-    """Test when no unlocked subagents are available."""
-    root = tmp_path / "agents"
-    root.mkdir()
-
-    # Create one locked subagent
-    subagent = root / "subagent-1"
-    subagent.mkdir()
-    (subagent / DEFAULT_LOCK_NAME).touch()
-
-    unlocked = find_unlocked_subagent(root)
-    assert unlocked is None
-
-
-def test_find_unlocked_subagent_nonexistent_root(tmp_path: Path) -> None:
-    """Test when the subagent root doesn't exist."""
-    root = tmp_path / "nonexistent"
-    unlocked = find_unlocked_subagent(root)
-    assert unlocked is None
+    def test_find_unlocked_subagent_nonexistent_root(self, tmp_path: Path) -> None:
+        """Test when the subagent root doesn't exist."""
+        root = tmp_path / "nonexistent"
+        unlocked = find_unlocked_subagent(root)
+        assert unlocked is None
 
 
 def test_copy_agent_config(agent_template: Path, tmp_path: Path) -> None:
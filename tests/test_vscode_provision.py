@@ -2,22 +2,18 @@
 
 from __future__ import annotations
 
+import os
 from argparse import Namespace
+from dataclasses import dataclass
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
 from subagent.vscode.provision import provision_subagents, DEFAULT_LOCK_NAME
 from subagent.vscode.cli import handle_provision
 
-
-@pytest.fixture
-def template_dir(tmp_path: Path) -> Path:
-    """Create a minimal template directory."""
-    template = tmp_path / "template"
-    template.mkdir()
-    (template / "subagent.code-workspace").write_text("{}\n")
-    return template
+from helpers import lock_path, seed
 
 
 @pytest.fixture
@@ -28,217 +24,164 @@ def target_root(tmp_path: Path) -> Path:
     return target
 
 
-def test_provision_single_subagent(template_dir: Path, target_root: Path) -> None:
-    """Test provisioning a single subagent."""
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=1,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    assert len(created) == 1
-    assert len(skipped_existing) == 0
-    assert len(skipped_locked) == 0
-
-    subagent_dir = target_root / "subagent-1"
-    assert subagent_dir.exists()
-    assert (subagent_dir / "subagent-1.code-workspace").exists()
-
+@pytest.fixture(scope="module")
+def readonly_target_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a target root shared by tests that fail validation before any I/O."""
+    return tmp_path_factory.mktemp("agents_ro")
+
+
+@dataclass(frozen=True)
+class ProvCase:
+    """A provisioning scenario and its expected outcome."""
+
+    pre_existing: int = 0
+    pre_locks: tuple[int, ...] = ()
+    subagents: int = 1
+    force: bool = False
+    dry_run: bool = False
+    expected: tuple[int, int, int] = (1, 0, 0)
+    created: tuple[int, ...] = (1,)
+    # Pre-existing subagents that get a user file which must survive provisioning
+    keep_files: tuple[int, ...] = ()
+
+
+PROVISION_CASES = [
+    pytest.param(ProvCase(), id="single"),
+    pytest.param(
+        ProvCase(subagents=3, expected=(3, 0, 0), created=(1, 2, 3)),
+        id="multiple",
+    ),
+    pytest.param(
+        ProvCase(pre_existing=1, expected=(0, 1, 0), created=()),
+        id="skip_existing",
+    ),
+    # Locked subagent-1 is skipped and subagent-2 is created instead
+    pytest.param(
+        ProvCase(pre_existing=1, pre_locks=(1,), expected=(1, 0, 1), created=(2,)),
+        id="skip_locked",
+    ),
+    pytest.param(
+        ProvCase(
+            pre_existing=1,
+            force=True,
+            expected=(1, 0, 0),
+            created=(1,),
+            keep_files=(1,),
+        ),
+        id="force_unlocked",
+    ),
+    # Locked subagents are unlocked and overwritten with --force
+    pytest.param(
+        ProvCase(
+            pre_existing=2,
+            pre_locks=(1, 2),
+            subagents=2,
+            force=True,
+            expected=(2, 0, 0),
+            created=(1, 2),
+        ),
+        id="force_locked",
+    ),
+    pytest.param(
+        ProvCase(subagents=2, dry_run=True, expected=(2, 0, 0), created=(1, 2)),
+        id="dry_run",
+    ),
+    # Both existing subagents are locked, so subagent-3 and subagent-4 are created
+    pytest.param(
+        ProvCase(
+            pre_existing=2,
+            pre_locks=(1, 2),
+            subagents=2,
+            expected=(2, 0, 2),
+            created=(3, 4),
+        ),
+        id="additional_when_locked",
+    ),
+    # subagent-2 is reused, subagent-4 is created to reach two unlocked
+    pytest.param(
+        ProvCase(
+            pre_existing=3,
+            pre_locks=(1, 3),
+            subagents=2,
+            expected=(1, 1, 2),
+            created=(4,),
+        ),
+        id="partial_locked",
+    ),
+    # --force overwrites the first two regardless of lock status
+    pytest.param(
+        ProvCase(
+            pre_existing=4,
+            pre_locks=(1, 2),
+            subagents=2,
+            force=True,
+            expected=(2, 0, 0),
+            created=(1, 2),
+        ),
+        id="force_mixed_locked_unlocked",
+    ),
+]
+
+
+@pytest.mark.parametrize("case", PROVISION_CASES)
+def test_provision_matrix(
+    case: ProvCase,
+    template_dir: Path,
+    target_root: Path,
+) -> None:
+    """Test provisioning outcomes across existing, locked, force and dry-run states."""
+    if case.pre_existing:
+        provision_subagents(
+            template=template_dir,
+            target_root=target_root,
+            subagents=case.pre_existing,
+            lock_name=DEFAULT_LOCK_NAME,
+            force=False,
+            dry_run=False,
+        )
+    seed(target_root, files=[f"subagent-{i}/{DEFAULT_LOCK_NAME}" for i in case.pre_locks])
+    for i in case.keep_files:
+        (target_root / f"subagent-{i}" / "marker.txt").write_text("should remain")
 
-def test_provision_multiple_subagents(template_dir: Path, target_root: Path) -> None:
-    """Test provisioning multiple subagents."""
     created, skipped_existing, skipped_locked = provision_subagents(
         template=template_dir,
         target_root=target_root,
-        subagents=3,
+        subagents=case.subagents,
         lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
+        force=case.force,
+        dry_run=case.dry_run,
     )
 
-    assert len(created) == 3
-    assert len(skipped_existing) == 0
-    assert len(skipped_locked) == 0
+    assert (len(created), len(skipped_existing), len(skipped_locked)) == case.expected
+    assert [d.name for d in created] == [f"subagent-{i}" for i in case.created]
 
-    for i in range(1, 4):
+    for i in case.created:
         subagent_dir = target_root / f"subagent-{i}"
-        assert subagent_dir.exists()
-
-
-def test_provision_skip_existing(template_dir: Path, target_root: Path) -> None:
-    """Test that existing unlocked subagents are skipped without --force."""
-    # Create initial subagent
-    provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=1,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    # Provision again without force
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=1,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    assert len(created) == 0
-    assert len(skipped_existing) == 1
-    assert len(skipped_locked) == 0
+        if case.dry_run:
+            # Dry runs report the plan without touching the filesystem
+            assert subagent_dir.exists() == (i <= case.pre_existing)
+        else:
+            assert (subagent_dir / f"subagent-{i}.code-workspace").exists()
 
+    # We don't delete user files, only overwrite template files
+    for i in case.keep_files:
+        assert (target_root / f"subagent-{i}" / "marker.txt").exists()
 
-def test_provision_skip_locked(template_dir: Path, target_root: Path) -> None:
-    """Test that locked subagents are skipped without --force."""
-    # Create initial subagent
-    provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=1,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    # Create lock file
-    lock_file = target_root / "subagent-1" / DEFAULT_LOCK_NAME
-    lock_file.touch()
-
-    # Request 1 unlocked subagent without force - should skip subagent-1 and create subagent-2
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=1,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
+    # Pre-existing subagents are never removed
+    for i in range(1, case.pre_existing + 1):
+        assert (target_root / f"subagent-{i}").exists()
 
-    assert len(created) == 1  # subagent-2 (newly created)
-    assert len(skipped_existing) == 0
-    assert len(skipped_locked) == 1  # subagent-1 was skipped
-    
-    # Both should exist
-    assert (target_root / "subagent-1").exists()
-    assert (target_root / "subagent-2").exists()
-    # Template files should exist
-    assert (target_root / "subagent-2" / "subagent-2.code-workspace").exists()
-    # Lock file still exists
-    assert lock_file.exists()
-
-
-def test_provision_force_unlocked(template_dir: Path, target_root: Path) -> None:
-    """Test that unlocked subagents are overwritten with --force."""
-    # Create initial subagent
-    provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=1,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    # Add a marker file
-    marker = target_root / "subagent-1" / "marker.txt"
-    marker.write_text("should remain")
-
-    # Provision with force - unlocked subagents are overwritten
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=1,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=True,
-        dry_run=False,
-    )
-
-    assert len(created) == 1
-    assert len(skipped_existing) == 0
-    assert len(skipped_locked) == 0
-
-    # Marker file remains (we don't delete files, just overwrite template files)
-    assert marker.exists()
-    # Template files should still exist
-    assert (target_root / "subagent-1" / "subagent-1.code-workspace").exists()
-
-
-def test_provision_force_locked(template_dir: Path, target_root: Path) -> None:
-    """Test that locked subagents are unlocked and overwritten with --force."""
-    # Create 2 initial subagents
-    provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=2,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
+    # Lock files are only removed from subagents that were forcibly reused
+    for i in case.pre_locks:
+        assert os.path.lexists(lock_path(target_root, i)) != (case.force and i in case.created)
 
-    # Lock both subagents
-    lock_file_1 = target_root / "subagent-1" / DEFAULT_LOCK_NAME
-    lock_file_2 = target_root / "subagent-2" / DEFAULT_LOCK_NAME
-    lock_file_1.touch()
-    lock_file_2.touch()
 
-    # Request 2 subagents with force=True - should unlock and reuse both locked subagents
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=2,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=True,
-        dry_run=False,
-    )
-
-    assert len(created) == 2  # Both locked subagents were unlocked and overwritten
-    assert len(skipped_existing) == 0
-    assert len(skipped_locked) == 0  # No locked subagents remain
-    
-    # Both should exist
-    assert (target_root / "subagent-1").exists()
-    assert (target_root / "subagent-2").exists()
-    # Template files should exist
-    assert (target_root / "subagent-1" / "subagent-1.code-workspace").exists()
-    assert (target_root / "subagent-2" / "subagent-2.code-workspace").exists()
-    # Lock files should be removed
-    assert not lock_file_1.exists()
-    assert not lock_file_2.exists()
-
-
-def test_provision_dry_run(template_dir: Path, target_root: Path) -> None:
-    """Test that dry run doesn't create files."""
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=2,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=True,
-    )
-
-    assert len(created) == 2
-    assert len(skipped_existing) == 0
-    assert len(skipped_locked) == 0
-
-    # Nothing should actually exist
-    assert not (target_root / "subagent-1").exists()
-    assert not (target_root / "subagent-2").exists()
-
-
-def test_provision_invalid_template(target_root: Path) -> None:
+def test_provision_invalid_template(readonly_target_root: Path) -> None:
     """Test that invalid template path raises an error."""
     with pytest.raises(ValueError, match="not a directory"):
         provision_subagents(
             template=Path("/nonexistent/path"),
-            target_root=target_root,
+            target_root=readonly_target_root,
             subagents=1,
             lock_name=DEFAULT_LOCK_NAME,
             force=False,
@@ -246,12 +189,12 @@ def test_provision_invalid_template(target_root: Path) -> None:
         )
 
 
-def test_provision_zero_subagents(template_dir: Path, target_root: Path) -> None:
+def test_provision_zero_subagents(template_dir: Path, readonly_target_root: Path) -> None:
     """Test that zero subagents raises an error."""
     with pytest.raises(ValueError, match="positive integer"):
         provision_subagents(
             template=template_dir,
-            target_root=target_root,
+            target_root=readonly_target_root,
             subagents=0,
             lock_name=DEFAULT_LOCK_NAME,
             force=False,
@@ -259,84 +202,10 @@ def test_provision_zero_subagents(template_dir: Path, target_root: Path) -> None
         )
 
 
-def test_provision_additional_when_locked(template_dir: Path, target_root: Path) -> None:
-    """Test that new subagents are provisioned when existing ones are locked."""
-    # Create 2 initial subagents
-    provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=2,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    # Lock both subagents
-    (target_root / "subagent-1" / DEFAULT_LOCK_NAME).touch()
-    (target_root / "subagent-2" / DEFAULT_LOCK_NAME).touch()
-
-    # Request 2 unlocked subagents - should create subagent-3 and subagent-4
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=2,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    assert len(created) == 2
-    assert len(skipped_existing) == 0
-    assert len(skipped_locked) == 2
-
-    # Should have created subagent-3 and subagent-4
-    assert (target_root / "subagent-3").exists()
-    assert (target_root / "subagent-4").exists()
-    
-    # Original locked subagents should still exist
-    assert (target_root / "subagent-1").exists()
-    assert (target_root / "subagent-2").exists()
-
-
-def test_provision_partial_locked(template_dir: Path, target_root: Path) -> None:
-    """Test provisioning when some subagents are locked and some are unlocked."""
-    # Create 3 initial subagents
-    provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=3,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    # Lock subagent-1 and subagent-3, leave subagent-2 unlocked
-    (target_root / "subagent-1" / DEFAULT_LOCK_NAME).touch()
-    (target_root / "subagent-3" / DEFAULT_LOCK_NAME).touch()
-
-    # Request 2 unlocked subagents - already have 1 unlocked (subagent-2),
-    # so should create 1 additional (subagent-4)
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=2,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    assert len(created) == 1
-    assert len(skipped_existing) == 1  # subagent-2
-    assert len(skipped_locked) == 2  # subagent-1 and subagent-3
-
-    # Should have created subagent-4
-    assert (target_root / "subagent-4").exists()
-
-
 def test_handle_provision_runs_warmup(
     template_dir: Path,
     tmp_path: Path,
-    monkeypatch: pytest.MonkeyPatch,
+    fake_warmup: MagicMock,
 ) -> None:
     """Ensure handle_provision triggers warmup when requested."""
 
@@ -351,32 +220,21 @@ def test_handle_provision_runs_warmup(
         warmup=True,
     )
 
-    warmup_calls: dict[str, object] = {}
-
-    def fake_warmup(*, subagent_root: Path, subagents: int, dry_run: bool, vscode_cmd: str = "code") -> int:
-        warmup_calls["root"] = subagent_root
-        warmup_calls["count"] = subagents
-        warmup_calls["dry_run"] = dry_run
-        warmup_calls["vscode_cmd"] = vscode_cmd
-        return 0
-
-    monkeypatch.setattr("subagent.vscode.cli.warmup_subagents", fake_warmup)
-
     result = handle_provision(args)
 
     assert result == 0
-    assert warmup_calls == {
-        "root": target_root,
-        "count": 1,
-        "dry_run": False,
-        "vscode_cmd": "code",
-    }
+    fake_warmup.assert_called_once_with(
+        subagent_root=target_root,
+        subagents=1,
+        dry_run=False,
+        vscode_cmd="code",
+    )
 
 
 def test_handle_provision_skips_warmup_during_dry_run(
     template_dir: Path,
     tmp_path: Path,
-    monkeypatch: pytest.MonkeyPatch,
+    fake_warmup: MagicMock,
 ) -> None:
     """Ensure warmup is not triggered when provisioning is a dry run."""
 
@@ -391,61 +249,10 @@ def test_handle_provision_skips_warmup_during_dry_run(
         warmup=True,
     )
 
-    def fake_warmup(*args: object, **kwargs: object) -> int:  # pragma: no cover
-        raise AssertionError("warmup should not be called during dry run")
-
-    monkeypatch.setattr("subagent.vscode.cli.warmup_subagents", fake_warmup)
-
     result = handle_provision(args)
 
     assert result == 0
-
-
-def test_provision_force_mixed_locked_unlocked(
-    template_dir: Path,
-    target_root: Path,
-) -> None:
-    """Test --force with a mix of locked and unlocked subagents."""
-    # Create 4 initial subagents
-    provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=4,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=False,
-        dry_run=False,
-    )
-
-    # Lock subagent-1 and subagent-2, leave subagent-3 and subagent-4 unlocked
-    lock_file_1 = target_root / "subagent-1" / DEFAULT_LOCK_NAME
-    lock_file_2 = target_root / "subagent-2" / DEFAULT_LOCK_NAME
-    lock_file_1.touch()
-    lock_file_2.touch()
-
-    # Request 2 subagents with force=True - should overwrite the first 2
-    # (regardless of lock status)
-    created, skipped_existing, skipped_locked = provision_subagents(
-        template=template_dir,
-        target_root=target_root,
-        subagents=2,
-        lock_name=DEFAULT_LOCK_NAME,
-        force=True,
-        dry_run=False,
-    )
-
-    assert len(created) == 2  # subagent-1 and subagent-2 (both overwritten)
-    assert len(skipped_existing) == 0  # None skipped
-    assert len(skipped_locked) == 0  # No locked subagents remain
-    
-    # All should exist
-    assert (target_root / "subagent-1").exists()
-    assert (target_root / "subagent-2").exists()
-    assert (target_root / "subagent-3").exists()
-    assert (target_root / "subagent-4").exists()
-    
-    # Lock files should be removed from the ones that were locked
-    assert not lock_file_1.exists()
-    assert not lock_file_2.exists()
+    fake_warmup.assert_not_called()
 
 
 def test_provision_force_dir_in_use(
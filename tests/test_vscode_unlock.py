@@ -2,191 +2,87 @@
 
 from __future__ import annotations
 
+import os
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 
 import pytest
 
 from subagent.vscode.provision import unlock_subagents, DEFAULT_LOCK_NAME
 
-
-@pytest.fixture
-def target_root_with_locks(tmp_path: Path) -> Path:
-    """Create a target root with some locked and unlocked subagents."""
+from helpers import lock_path, seed
+
+
+@dataclass(frozen=True)
+class UnlockCase:
+    """An unlock request against subagent-1..3 and its expected outcome."""
+
+    id: str
+    subagent_name: str | None
+    unlock_all: bool
+    dry_run: bool = False
+    locked: tuple[int, ...] = (1, 3)
+    root_exists: bool = True
+    expected: tuple[int, ...] = ()
+    remaining: tuple[int, ...] = ()
+    error: str | None = None
+
+
+UNLOCK_CASES = [
+    UnlockCase("specific", "subagent-1", False, expected=(1,), remaining=(3,)),
+    UnlockCase("specific_not_locked", "subagent-2", False, remaining=(1, 3)),
+    UnlockCase("all", None, True, expected=(1, 3)),
+    UnlockCase(
+        "dry_run_specific", "subagent-1", False, dry_run=True, expected=(1,), remaining=(1, 3)
+    ),
+    UnlockCase("dry_run_all", None, True, dry_run=True, expected=(1, 3), remaining=(1, 3)),
+    UnlockCase("all_when_none_locked", None, True, locked=()),
+    UnlockCase("nonexistent_subagent", "subagent-99", False, error="does not exist"),
+    UnlockCase(
+        "nonexistent_root", "subagent-1", False, root_exists=False, error="does not exist"
+    ),
+    UnlockCase("missing_both_flags", None, False, error="must specify either"),
+    UnlockCase("both_flags_specified", "subagent-1", True, error="must specify either"),
+]
+
+
+def _build_target_root(tmp_path: Path, locked: tuple[int, ...]) -> Path:
+    """Create subagent-1..3 under a fresh root, locking the given indices."""
     root = tmp_path / "agents"
-    root.mkdir()
-    
-    # Create three subagents: 1 and 3 locked, 2 unlocked
-    for i in [1, 2, 3]:
-        subagent_dir = root / f"subagent-{i}"
-        subagent_dir.mkdir()
-        
-        if i in [1, 3]:
-            lock_file = subagent_dir / DEFAULT_LOCK_NAME
-            lock_file.touch()
-    
+    seed(
+        tmp_path,
+        ["agents", "agents/subagent-1", "agents/subagent-2", "agents/subagent-3"],
+        [f"agents/subagent-{i}/{DEFAULT_LOCK_NAME}" for i in locked],
+    )
     return root
 
 
-def test_unlock_specific_subagent(target_root_with_locks: Path) -> None:
-    """Test unlocking a specific locked subagent."""
-    unlocked = unlock_subagents(
-        target_root=target_root_with_locks,
-        lock_name=DEFAULT_LOCK_NAME,
-        subagent_name="subagent-1",
-        unlock_all=False,
-        dry_run=False,
-    )
-    
-    assert len(unlocked) == 1
-    assert unlocked[0].name == "subagent-1"
-    
-    # Verify lock file was removed
-    lock_file = target_root_with_locks / "subagent-1" / DEFAULT_LOCK_NAME
-    assert not lock_file.exists()
-    
-    # Verify other locks are still in place
-    lock_file_3 = target_root_with_locks / "subagent-3" / DEFAULT_LOCK_NAME
-    assert lock_file_3.exists()
-
-
-def test_unlock_specific_subagent_not_locked(target_root_with_locks: Path) -> None:
-    """Test unlocking a subagent that's not locked returns empty list."""
-    unlocked = unlock_subagents(
-        target_root=target_root_with_locks,
+@pytest.mark.parametrize("case", UNLOCK_CASES, ids=attrgetter("id"))
+def test_unlock_subagents(case: UnlockCase, tmp_path: Path) -> None:
+    """Test unlock results and on-disk lock state for each request shape."""
+    if case.root_exists:
+        root = _build_target_root(tmp_path, case.locked)
+    else:
+        root = tmp_path / "nonexistent"
+
+    kwargs = dict(
+        target_root=root,
         lock_name=DEFAULT_LOCK_NAME,
-        subagent_name="subagent-2",
-        unlock_all=False,
-        dry_run=False,
+        subagent_name=case.subagent_name,
+        unlock_all=case.unlock_all,
+        dry_run=case.dry_run,
     )
-    
-    assert len(unlocked) == 0
 
+    if case.error is not None:
+        with pytest.raises(ValueError, match=case.error):
+            unlock_subagents(**kwargs)
+        return
 
-def test_unlock_all_subagents(target_root_with_locks: Path) -> None:
-    """Test unlocking all locked subagents."""
-    unlocked = unlock_subagents(
-        target_root=target_root_with_locks,
-        lock_name=DEFAULT_LOCK_NAME,
-        subagent_name=None,
-        unlock_all=True,
-        dry_run=False,
-    )
-    
-    assert len(unlocked) == 2
-    assert unlocked[0].name == "subagent-1"
-    assert unlocked[1].name == "subagent-3"
-    
-    # Verify all lock files were removed
-    for i in [1, 3]:
-        lock_file = target_root_with_locks / f"subagent-{i}" / DEFAULT_LOCK_NAME
-        assert not lock_file.exists()
-
-
-def test_unlock_dry_run_specific(target_root_with_locks: Path) -> None:
-    """Test that dry run doesn't remove lock files for specific subagent."""
-    unlocked = unlock_subagents(
-        target_root=target_root_with_locks,
-        lock_name=DEFAULT_LOCK_NAME,
-        subagent_name="subagent-1",
-        unlock_all=False,
-        dry_run=True,
-    )
-    
-    assert len(unlocked) == 1
-    assert unlocked[0].name == "subagent-1"
-    
-    # Verify lock file still exists
-    lock_file = target_root_with_locks / "subagent-1" / DEFAULT_LOCK_NAME
-    assert lock_file.exists()
-
-
-def test_unlock_dry_run_all(target_root_with_locks: Path) -> None:
-    """Test that dry run doesn't remove lock files when unlocking all."""
-    unlocked = unlock_subagents(
-        target_root=target_root_with_locks,
-        lock_name=DEFAULT_LOCK_NAME,
-        subagent_name=None,
-        unlock_all=True,
-        dry_run=True,
-    )
-    
-    assert len(unlocked) == 2
-    
-    # Verify lock files still exist
-    for i in [1, 3]:
-        lock_file = target_root_with_locks / f"subagent-{i}" / DEFAULT_LOCK_NAME
-        assert lock_file.exists()
+    unlocked = unlock_subagents(**kwargs)
 
+    # Unlocked subagents are reported in numeric order
+    assert [d.name for d in unlocked] == [f"subagent-{i}" for i in case.expected]
 
-def test_unlock_nonexistent_subagent(tmp_path: Path) -> None:
-    """Test that unlocking a nonexistent subagent raises ValueError."""
-    root = tmp_path / "agents"
-    root.mkdir()
-    
-    with pytest.raises(ValueError, match="does not exist"):
-        unlock_subagents(
-            target_root=root,
-            lock_name=DEFAULT_LOCK_NAME,
-            subagent_name="subagent-99",
-            unlock_all=False,
-            dry_run=False,
-        )
-
-
-def test_unlock_nonexistent_root(tmp_path: Path) -> None:
-    """Test that unlocking from a nonexistent root raises ValueError."""
-    root = tmp_path / "nonexistent"
-    
-    with pytest.raises(ValueError, match="does not exist"):
-        unlock_subagents(
-            target_root=root,
-            lock_name=DEFAULT_LOCK_NAME,
-            subagent_name="subagent-1",
-            unlock_all=False,
-            dry_run=False,
-        )
-
-
-def test_unlock_missing_both_flags(target_root_with_locks: Path) -> None:
-    """Test that not specifying --subagent or --all raises ValueError."""
-    with pytest.raises(ValueError, match="must specify either"):
-        unlock_subagents(
-            target_root=target_root_with_locks,
-            lock_name=DEFAULT_LOCK_NAME,
-            subagent_name=None,
-            unlock_all=False,
-            dry_run=False,
-        )
-
-
-def test_unlock_both_flags_specified(target_root_with_locks: Path) -> None:
-    """Test that specifying both --subagent and --all raises ValueError."""
-    with pytest.raises(ValueError, match="must specify either"):
-        unlock_subagents(
-            target_root=target_root_with_locks,
-            lock_name=DEFAULT_LOCK_NAME,
-            subagent_name="subagent-1",
-            unlock_all=True,
-            dry_run=False,
-        )
-
-
-def test_unlock_all_when_none_locked(tmp_path: Path) -> None:
-    """Test that unlocking all when no subagents are locked returns empty list."""
-    root = tmp_path / "agents"
-    root.mkdir()
-    
-    # Create unlocked subagents
-    for i in [1, 2]:
-        subagent_dir = root / f"subagent-{i}"
-        subagent_dir.mkdir()
-    
-    unlocked = unlock_subagents(
-        target_root=root,
-        lock_name=DEFAULT_LOCK_NAME,
-        subagent_name=None,
-        unlock_all=True,
-        dry_run=False,
-    )
-    
-    assert len(unlocked) == 0
+    for i in [1, 2, 3]:
+        assert os.path.lexists(lock_path(root, i)) == (i in case.remaining)
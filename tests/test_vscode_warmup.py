@@ -2,20 +2,21 @@
 
 from __future__ import annotations
 
-import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from typing import Callable
+from unittest.mock import MagicMock
 
 import pytest
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from subagent.vscode.agent_dispatch import (
     get_all_subagent_workspaces,
     warmup_subagents,
 )
 
+# These exercise discovery against the real filesystem; the same logic is
+# covered in-memory by test_vscode_warmup_fakefs.py for fast runs.
+pytestmark = pytest.mark.slow
+
 
 def test_get_all_subagent_workspaces_empty_dir(tmp_path: Path) -> None:
     """Test that get_all_subagent_workspaces returns empty list for empty directory."""
@@ -30,27 +31,12 @@ def test_get_all_subagent_workspaces_nonexistent_dir(tmp_path: Path) -> None:
     assert result == []
 
 
-def test_get_all_subagent_workspaces_with_workspaces(tmp_path: Path) -> None:
+def test_get_all_subagent_workspaces_with_workspaces(workspace_tree: Path) -> None:
     """Test that get_all_subagent_workspaces finds workspace files."""
-    # Create subagent directories with workspace files
-    for i in [1, 3, 2]:  # Out of order to test sorting
-        subagent_dir = tmp_path / f"subagent-{i}"
-        subagent_dir.mkdir()
-        workspace_file = subagent_dir / f"subagent-{i}.code-workspace"
-        workspace_file.write_text("{}", encoding="utf-8")
+    result = get_all_subagent_workspaces(workspace_tree)
     
-    # Create a directory that shouldn't be picked up
-    other_dir = tmp_path / "other-dir"
-    other_dir.mkdir()
-    (other_dir / "subagent.code-workspace").write_text("{}", encoding="utf-8")
-    
-    result = get_all_subagent_workspaces(tmp_path)
-    
-    assert len(result) == 3
-    # Should be sorted by number
-    assert result[0].parent.name == "subagent-1"
-    assert result[1].parent.name == "subagent-2"
-    assert result[2].parent.name == "subagent-3"
+    # Should be sorted by number, skipping other-dir
+    assert [w.parent.name for w in result] == [f"subagent-{i}" for i in range(1, 6)]
 
 
 def test_get_all_subagent_workspaces_missing_workspace_file(tmp_path: Path) -> None:
@@ -69,93 +55,49 @@ def test_warmup_subagents_no_workspaces(tmp_path: Path) -> None:
     assert result == 1
 
 
-@patch("subprocess.Popen")
-def test_warmup_subagents_dry_run(mock_popen: MagicMock, tmp_path: Path) -> None:
+def test_warmup_subagents_dry_run(mock_popen: MagicMock, workspace_tree: Path) -> None:
     """Test that warmup_subagents in dry-run mode doesn't open workspaces."""
-    # Create subagent with workspace
-    subagent_dir = tmp_path / "subagent-1"
-    subagent_dir.mkdir()
-    workspace_file = subagent_dir / "subagent-1.code-workspace"
-    workspace_file.write_text("{}", encoding="utf-8")
-    
-    result = warmup_subagents(subagent_root=tmp_path, dry_run=True)
+    result = warmup_subagents(subagent_root=workspace_tree, dry_run=True)
     
     assert result == 0
     mock_popen.assert_not_called()
 
 
-@patch("subprocess.Popen")
-def test_warmup_subagents_opens_workspaces(
-    mock_popen: MagicMock,
-    tmp_path: Path,
-) -> None:
-    """Test that warmup_subagents opens all workspaces."""
-    # Create multiple subagent directories
-    for i in [1, 2, 3]:
-        subagent_dir = tmp_path / f"subagent-{i}"
-        subagent_dir.mkdir()
-        workspace_file = subagent_dir / f"subagent-{i}.code-workspace"
-        workspace_file.write_text("{}", encoding="utf-8")
-    
-    result = warmup_subagents(subagent_root=tmp_path, subagents=3)
-    
-    assert result == 0
-    assert mock_popen.call_count == 3
-
-
-@patch("subprocess.Popen", side_effect=Exception("Failed to open"))
 def test_warmup_subagents_handles_errors(
     mock_popen: MagicMock,
-    tmp_path: Path,
+    workspace_tree: Path,
 ) -> None:
     """Test that warmup_subagents handles errors gracefully."""
-    # Create subagent with workspace
-    subagent_dir = tmp_path / "subagent-1"
-    subagent_dir.mkdir()
-    workspace_file = subagent_dir / "subagent-1.code-workspace"
-    workspace_file.write_text("{}", encoding="utf-8")
-    
+    mock_popen.side_effect = Exception("Failed to open")
+
     # Should complete despite the error
-    result = warmup_subagents(subagent_root=tmp_path)
+    result = warmup_subagents(subagent_root=workspace_tree)
     assert result == 0
     mock_popen.assert_called_once()
 
 
-@patch("subprocess.Popen")
-def test_warmup_subagents_respects_count_limit(
-    mock_popen: MagicMock,
-    tmp_path: Path,
-) -> None:
-    """Test that warmup_subagents only opens the specified number of workspaces."""
-    # Create 5 subagent directories
-    for i in [1, 2, 3, 4, 5]:
-        subagent_dir = tmp_path / f"subagent-{i}"
-        subagent_dir.mkdir()
-        workspace_file = subagent_dir / f"subagent-{i}.code-workspace"
-        workspace_file.write_text("{}", encoding="utf-8")
-    
-    # Only open 2
-    result = warmup_subagents(subagent_root=tmp_path, subagents=2)
-    
-    assert result == 0
-    assert mock_popen.call_count == 2
-
-
-@patch("subprocess.Popen")
-def test_warmup_subagents_default_opens_one(
+@pytest.mark.parametrize(
+    ("created", "requested", "expected"),
+    [
+        pytest.param(3, 3, 3, id="opens_all"),
+        pytest.param(5, 2, 2, id="respects_count_limit"),
+        pytest.param(3, None, 1, id="default_opens_one"),
+        pytest.param(2, 5, 2, id="fewer_than_requested"),
+    ],
+)
+def test_warmup_subagents_counts(
     mock_popen: MagicMock,
-    tmp_path: Path,
+    workspace_tree_factory: Callable[[int], Path],
+    created: int,
+    requested: int | None,
+    expected: int,
 ) -> None:
-    """Test that warmup_subagents defaults to opening 1 workspace."""
-    # Create 3 subagent directories
-    for i in [1, 2, 3]:
-        subagent_dir = tmp_path / f"subagent-{i}"
-        subagent_dir.mkdir()
-        workspace_file = subagent_dir / f"subagent-{i}.code-workspace"
-        workspace_file.write_text("{}", encoding="utf-8")
+    """Test how many workspaces warmup_subagents opens for a requested count."""
+    root = workspace_tree_factory(created)
+    # Leave subagents unset to exercise the default of 1
+    kwargs = {} if requested is None else {"subagents": requested}
     
-    # Don't specify subagents parameter (should default to 1)
-    result = warmup_subagents(subagent_root=tmp_path)
+    result = warmup_subagents(subagent_root=root, **kwargs)
     
     assert result == 0
-    assert mock_popen.call_count == 1
+    assert mock_popen.call_count == expected
@@ -0,0 +1,103 @@
+"""In-memory variants of the warmup discovery tests using pyfakefs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
+
+from subagent.vscode.agent_dispatch import (
+    get_all_subagent_workspaces,
+    warmup_subagents,
+)
+
+from helpers import WORKSPACE_BYTES
+
+ROOT = Path("/agents")
+
+
+def _create_workspaces(fs: FakeFilesystem, numbers: list[int]) -> None:
+    """Create subagent-N/subagent-N.code-workspace under ROOT for each N."""
+    for i in numbers:
+        fs.create_file(
+            ROOT / f"subagent-{i}" / f"subagent-{i}.code-workspace",
+            contents=WORKSPACE_BYTES,
+        )
+
+
+def test_get_all_subagent_workspaces_empty_dir(fs: FakeFilesystem) -> None:
+    """Test that get_all_subagent_workspaces returns empty list for empty directory."""
+    fs.create_dir(ROOT)
+    assert get_all_subagent_workspaces(ROOT) == []
+
+
+def test_get_all_subagent_workspaces_nonexistent_dir(fs: FakeFilesystem) -> None:
+    """Test that get_all_subagent_workspaces returns empty list for nonexistent directory."""
+    assert get_all_subagent_workspaces(ROOT / "does_not_exist") == []
+
+
+def test_get_all_subagent_workspaces_with_workspaces(fs: FakeFilesystem) -> None:
+    """Test that get_all_subagent_workspaces finds and sorts workspace files."""
+    _create_workspaces(fs, [1, 3, 2])  # Out of order to test sorting
+    # A directory that shouldn't be picked up
+    fs.create_file(ROOT / "other-dir" / "subagent.code-workspace", contents=WORKSPACE_BYTES)
+
+    result = get_all_subagent_workspaces(ROOT)
+
+    assert [w.parent.name for w in result] == ["subagent-1", "subagent-2", "subagent-3"]
+
+
+def test_get_all_subagent_workspaces_missing_workspace_file(fs: FakeFilesystem) -> None:
+    """Test that subagents without workspace files are skipped."""
+    fs.create_dir(ROOT / "subagent-1")
+    assert get_all_subagent_workspaces(ROOT) == []
+
+
+def test_warmup_subagents_no_workspaces(fs: FakeFilesystem) -> None:
+    """Test that warmup_subagents returns error when no workspaces found."""
+    fs.create_dir(ROOT)
+    assert warmup_subagents(subagent_root=ROOT, dry_run=True) == 1
+
+
+def test_warmup_subagents_dry_run(fs: FakeFilesystem, mock_popen: MagicMock) -> None:
+    """Test that warmup_subagents in dry-run mode doesn't open workspaces."""
+    _create_workspaces(fs, [1, 2])
+
+    assert warmup_subagents(subagent_root=ROOT, dry_run=True) == 0
+    mock_popen.assert_not_called()
+
+
+def test_warmup_subagents_handles_errors(fs: FakeFilesystem, mock_popen: MagicMock) -> None:
+    """Test that warmup_subagents handles errors gracefully."""
+    _create_workspaces(fs, [1, 2])
+    mock_popen.side_effect = Exception("Failed to open")
+
+    # Should complete despite the error
+    assert warmup_subagents(subagent_root=ROOT) == 0
+    mock_popen.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("created", "requested", "expected"),
+    [
+        pytest.param(3, 3, 3, id="opens_all"),
+        pytest.param(5, 2, 2, id="respects_count_limit"),
+        pytest.param(3, None, 1, id="default_opens_one"),
+        pytest.param(2, 5, 2, id="fewer_than_requested"),
+    ],
+)
+def test_warmup_subagents_counts(
+    fs: FakeFilesystem,
+    mock_popen: MagicMock,
+    created: int,
+    requested: int | None,
+    expected: int,
+) -> None:
+    """Test how many workspaces warmup_subagents opens for a requested count."""
+    _create_workspaces(fs, list(range(1, created + 1)))
+    kwargs = {} if requested is None else {"subagents": requested}
+
+    assert warmup_subagents(subagent_root=ROOT, **kwargs) == 0
+    assert mock_popen.call_count == expected